@@ -1,17 +1,18 @@
+import io
+
+import numpy as np
 import pandas as pd
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
 
-# Função auxiliar para calcular variação percentual
+# Função auxiliar para calcular variação percentual (vetorizada: recebe Series/arrays inteiros)
 def analisar_variacao(count_atual, count_anterior):
-    if count_anterior == 0:
-        if count_atual == 0:
-            return 0, 0
-        else:
-            return 100.0, 1  # Considera 100% de variação se o anterior for zero e atual positivo
-    var = ((count_atual - count_anterior) / count_anterior) * 100
-    return var, 1 if var > 0 else -1
+    count_atual = np.asarray(count_atual, dtype=float)
+    count_anterior = np.asarray(count_anterior, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Considera 100% de variação se o anterior for zero e atual positivo
+        return np.where(count_anterior == 0, np.where(count_atual == 0, 0.0, 100.0), (count_atual - count_anterior) / count_anterior * 100)
 
 # Configurações iniciais do Streamlit
 st.set_page_config(page_title="Relatório Estratégico", layout="wide")
@@ -23,6 +24,12 @@ ORDEM_MESES = [
     'julho', 'agosto', 'setembro', 'outubro', 'novembro', 'dezembro'
 ]
 
+# Canais comparados em cada segmento ("Geral" soma todos os canais)
+CANAIS = ('Procon', 'Ouvidoria', 'Geral')
+
+# Colunas de baixa cardinalidade tratadas como categóricas
+COLUNAS_CATEGORICAS = ['segmento', 'ds_canal', 'natureza', 'motivo', 'fato_gerador_fato_gerador']
+
 # Função para processamento seguro dos dados
 def processar_dados(df):
     try:
@@ -33,7 +40,7 @@ def processar_dados(df):
             df.rename(columns={'mês': 'mes'}, inplace=True)
         
         # Conversão dos campos obrigatórios
-        df['ano'] = pd.to_numeric(df['ano'], errors='coerce').astype('Int64')
+        df['ano'] = pd.to_numeric(df['ano'], errors='coerce')
         df['mes'] = df['mes'].str.lower().str.strip()
         
         # Mapeamento de abreviações para nomes completos dos meses
@@ -42,11 +49,16 @@ def processar_dados(df):
             'mai': 'maio', 'jun': 'junho', 'jul': 'julho', 'ago': 'agosto',
             'set': 'setembro', 'out': 'outubro', 'nov': 'novembro', 'dez': 'dezembro'
         }
-        df['mes'] = df['mes'].replace(meses_map).astype('category')
-        df['mes'] = pd.Categorical(df['mes'], categories=ORDEM_MESES, ordered=True)
+        mes_mapeado = df['mes'].map(meses_map)
+        mes_mapeado = mes_mapeado.where(mes_mapeado.notna(), df['mes'])
+        df['mes'] = pd.Categorical(mes_mapeado, categories=ORDEM_MESES, ordered=True)
         
         # Elimina apenas linhas sem mês ou ano
-        df = df.dropna(subset=['mes', 'ano'])
+        df = df.dropna(subset=['mes', 'ano']).copy()
+        # Sem nulos, reduz o ano ao menor inteiro que comporta os valores (int16 para anos válidos);
+        # valores fora da faixa, como 202401, ficam em um tipo maior em vez de virarem um ano errado.
+        # O cast via Int64 rejeita anos fracionários (ex.: 2025.7) em vez de truncá-los
+        df['ano'] = pd.to_numeric(df['ano'].astype('Int64').astype('int64'), downcast='integer')
         
         # Preenche os demais campos com 'desconhecido' se estiverem faltando
         for col in ['segmento', 'ds_canal', 'natureza', 'motivo']:
@@ -59,199 +71,286 @@ def processar_dados(df):
         if 'fato_gerador_fato_gerador' not in df.columns:
             df['fato_gerador_fato_gerador'] = 'desconhecido'
         
+        # Colunas de baixa cardinalidade viram categóricas (códigos inteiros em groupby/filtros)
+        for col in COLUNAS_CATEGORICAS:
+            df[col] = df[col].astype('category')
+        
         return df
     except Exception as e:
         st.error(f"Erro no processamento: {str(e)}")
         return pd.DataFrame()
 
+# Carrega e processa o CSV uma única vez por conteúdo de arquivo (os bytes são a chave do cache)
+@st.cache_data(show_spinner="Processando...", max_entries=4)
+def load_df(file_bytes: bytes) -> pd.DataFrame:
+    try:
+        # Leitor do Arrow: tokenização paralela, bem mais rápida em arquivos grandes
+        df = pd.read_csv(io.BytesIO(file_bytes), delimiter=";", encoding='utf-8', engine='pyarrow')
+    except (ImportError, ValueError):
+        # Sem pyarrow ou arquivo que o Arrow rejeita (ex.: linha com colunas a mais/menos): usa o leitor C padrão
+        df = pd.read_csv(io.BytesIO(file_bytes), delimiter=";", low_memory=False, encoding='utf-8')
+    return processar_dados(df)
+
+# Recorte cacheado: o DataFrame (prefixo "_") não é hasheado, a chave "df_key" identifica sua origem
+@st.cache_data(max_entries=16)
+def filter_period(_df, df_key, mes, ano):
+    # Comparação direta em arrays NumPy: códigos do mês (categorias = ORDEM_MESES) e ano inteiro
+    mascara = (_df['mes'].cat.codes.to_numpy() == ORDEM_MESES.index(mes)) & (_df['ano'].to_numpy() == ano)
+    out = _df.iloc[mascara]
+    # Descarta categorias ausentes no período para encolher os resultados dos groupbys
+    return out.assign(**{col: out[col].cat.remove_unused_categories() for col in ['mes'] + COLUNAS_CATEGORICAS})
+
+# Contagens por segmento, canal e coluna em um único groupby; o "Geral" soma os canais
+def contagens_por_canal(df_periodo, coluna):
+    por_canal = df_periodo.groupby(['segmento', 'ds_canal', coluna], observed=True).size()
+    geral = por_canal.groupby(level=['segmento', coluna], observed=True).sum()
+    return por_canal, geral
+
+# Recorta as contagens de uma chave (segmento ou segmento/canal), vazio se não houver dados
+def fatia_contagem(contagens, chave):
+    try:
+        return contagens.loc[chave]
+    except KeyError:
+        return pd.Series(dtype='int64')
+
+# Tabela Atual/Anterior/Variação; reindexa no índice unido em vez do pd.concat, mantendo as contagens inteiras
+def tabela_comparativa(contagem_atual, contagem_anterior):
+    indice = contagem_atual.index.union(contagem_anterior.index, sort=False)
+    atual = contagem_atual.reindex(indice, fill_value=0)
+    anterior = contagem_anterior.reindex(indice, fill_value=0)
+    return pd.DataFrame({'Atual': atual, 'Anterior': anterior, 'Variação': atual - anterior})
+
+# Compara as contagens de motivos do período atual com o anterior de forma vetorizada
+def comparar_motivos(motivos_atual, motivos_anterior):
+    comparacao = pd.DataFrame({
+        'atual': motivos_atual,
+        'anterior': motivos_anterior.reindex(motivos_atual.index, fill_value=0),
+    })
+    comparacao['variacao'] = analisar_variacao(comparacao['atual'], comparacao['anterior'])
+    comparacao['cor'] = np.where(comparacao['variacao'] < 0, '#4CAF50', '#f44336')
+    return comparacao
+
+# Gráfico de comparação mensal com variação e cores (verde para redução, vermelho para aumento)
+@st.cache_data(max_entries=32)
+def build_comparativo_fig(mes_anterior, mes_atual, total_anterior, total_atual, variacao):
+    var_diff = total_atual - total_anterior
+    color_atual = '#f44336' if var_diff > 0 else '#4CAF50' if var_diff < 0 else 'gray'
+    fig_comp = go.Figure()
+    fig_comp.add_trace(go.Bar(
+        x=[mes_anterior.capitalize(), mes_atual.capitalize()],
+        y=[total_anterior, total_atual],
+        text=[total_anterior, total_atual],
+        textposition='auto',
+        marker_color=['blue', color_atual]
+    ))
+    fig_comp.update_layout(
+        title="🔄 Comparativo Mensal",
+        xaxis_title="Mês",
+        yaxis_title="Total de Reclamações",
+        template="plotly_white"
+    )
+    # Adiciona anotação com a variação percentual
+    fig_comp.add_annotation(
+        x=mes_atual.capitalize(),
+        y=total_atual,
+        text=f'Variação: {variacao:.2f}%',
+        showarrow=True,
+        arrowhead=1,
+        ax=0,
+        ay=-40,
+        font=dict(color=color_atual, size=14)
+    )
+    return fig_comp
+
+# Gráfico de evolução mensal de um segmento, memoizado pelos dados agregados
+@st.cache_data(max_entries=64)
+def build_evolucao_fig(df_evolucao, segmento):
+    fig_evolucao = px.line(df_evolucao, x='ano_mes', y='Reclamações', 
+                           title=f'Evolução Mensal de Reclamações - {segmento}',
+                           labels={'ano_mes': 'Mês/Ano', 'Reclamações': 'Total de Reclamações'},
+                           text='Reclamações',
+                           color='ano')
+    fig_evolucao.update_traces(
+        mode='lines+markers+text',
+        textposition='top center',
+        marker=dict(size=10),
+        line=dict(width=2.5),
+        textfont=dict(size=14, color='#2c3e50')
+    )
+    fig_evolucao.update_layout(
+        xaxis_title='Mês/Ano',
+        yaxis_title='Total de Reclamações',
+        template='plotly_white',
+        hovermode='x unified',
+        showlegend=True,
+        legend_title_text='Ano'
+    )
+    return fig_evolucao
+
+# Comparativo entre os períodos escolhidos; só este trecho reexecuta quando os filtros mudam
+@st.fragment
+def render_comparativo(df, df_key, segmentos):
+    # Filtros gerais
+    st.markdown("### 🔍 Filtros de Análise")
+    anos_disponiveis = sorted(df['ano'].dropna().unique(), reverse=True)
+    col_ano_atual, col_ano_anterior, col_mes_atual, col_mes_anterior = st.columns(4)
+    ano_atual = col_ano_atual.selectbox("Selecione o ano atual:", anos_disponiveis)
+    ano_anterior = col_ano_anterior.selectbox("Selecione o ano anterior:", anos_disponiveis)
+    mes_atual = col_mes_atual.selectbox("Mês atual:", ORDEM_MESES)
+    mes_anterior = col_mes_anterior.selectbox("Mês anterior:", ORDEM_MESES)
+    
+    # Filtros baseados em mês e ano
+    df_atual = filter_period(df, df_key, mes_atual, ano_atual)
+    df_anterior = filter_period(df, df_key, mes_anterior, ano_anterior)
+    
+    total_atual = len(df_atual)
+    total_anterior = len(df_anterior)
+    # Sem dados em nenhum dos períodos não há o que comparar; retorna sem interromper o restante da página
+    if total_atual == 0 and total_anterior == 0:
+        st.warning("Sem dados para o período selecionado")
+        return
+    var_diff = total_atual - total_anterior
+    variacao = ((var_diff) / total_anterior * 100) if total_anterior != 0 else 0
+    
+    # Resumo Geral
+    st.markdown("### 📊 Resumo Geral")
+    st.markdown(f"No mês de **{mes_atual.capitalize()} {ano_atual}**, tivemos uma variação de **{variacao:.2f}%** nas reclamações em comparação a {mes_anterior.capitalize()} {ano_anterior}.")
+    st.markdown(f"Total de reclamações: **{total_anterior} → {total_atual}**")
+    
+    # Impacto Geral por segmento no mês atual
+    segmento_contagem = df_atual['segmento'].value_counts(normalize=True, sort=False) * 100
+    # Com segmento categórico, value_counts inclui segmentos ausentes (zero ou NaN se vazio)
+    segmento_contagem = segmento_contagem[segmento_contagem > 0]
+    if not segmento_contagem.empty:
+        top_segmento = segmento_contagem.idxmax()
+        top_percentual = segmento_contagem.max()
+        st.markdown("📌 Impacto Geral")
+        st.markdown(f"O segmento **{top_segmento}** representa **{top_percentual:.2f}%** do total de reclamações em {mes_atual.capitalize()} {ano_atual}.")
+    
+    fig_comp = build_comparativo_fig(mes_anterior, mes_atual, total_anterior, total_atual, variacao)
+    st.plotly_chart(fig_comp, use_container_width=True)
+    
+    # Apenas segmentos com reclamações em algum dos dois períodos
+    totais_segmento = df_atual['segmento'].value_counts(sort=False).add(df_anterior['segmento'].value_counts(sort=False), fill_value=0)
+    segmentos_periodo = [segmento for segmento in segmentos if totais_segmento.get(segmento, 0) > 0]
+    
+    # Análise por Segmento e Canal (resumido)
+    st.header("📊 Análise por Segmento e Canal")
+    natureza_atual_canal, natureza_atual_geral = contagens_por_canal(df_atual, 'natureza')
+    natureza_anterior_canal, natureza_anterior_geral = contagens_por_canal(df_anterior, 'natureza')
+    motivo_atual_canal, motivo_atual_geral = contagens_por_canal(df_atual, 'motivo')
+    motivo_anterior_canal, motivo_anterior_geral = contagens_por_canal(df_anterior, 'motivo')
+    for segmento in segmentos_periodo:
+        st.subheader(f"Segmento: {segmento}")
+        # Recorta o segmento uma única vez; cada canal é buscado no recorte já reduzido
+        natureza_atual_segmento = fatia_contagem(natureza_atual_canal, segmento)
+        natureza_anterior_segmento = fatia_contagem(natureza_anterior_canal, segmento)
+        motivo_atual_segmento = fatia_contagem(motivo_atual_canal, segmento)
+        motivo_anterior_segmento = fatia_contagem(motivo_anterior_canal, segmento)
+        for canal in CANAIS:
+            if canal == 'Geral':
+                natureza_atual = fatia_contagem(natureza_atual_geral, segmento)
+                natureza_anterior = fatia_contagem(natureza_anterior_geral, segmento)
+                motivo_atual = fatia_contagem(motivo_atual_geral, segmento)
+                motivo_anterior = fatia_contagem(motivo_anterior_geral, segmento)
+            else:
+                natureza_atual = fatia_contagem(natureza_atual_segmento, canal)
+                natureza_anterior = fatia_contagem(natureza_anterior_segmento, canal)
+                motivo_atual = fatia_contagem(motivo_atual_segmento, canal)
+                motivo_anterior = fatia_contagem(motivo_anterior_segmento, canal)
+            if natureza_atual.empty and natureza_anterior.empty:
+                continue
+            st.markdown(f"**{canal} - {mes_atual.capitalize()} {ano_atual} vs {mes_anterior.capitalize()} {ano_anterior}**")
+            # Comparação de Natureza
+            st.dataframe(tabela_comparativa(natureza_atual, natureza_anterior))
+            # Comparação de Motivo
+            st.dataframe(tabela_comparativa(motivo_atual, motivo_anterior))
+    
+    # Análise Detalhada por Natureza (comparando período atual e anterior)
+    st.header("🔍 Análise Detalhada por Natureza")
+    # Motivos e fatos geradores por segmento/natureza, calculados uma vez por período
+    motivo_natureza_atual = df_atual.groupby(['segmento', 'natureza', 'motivo'], observed=True).size()
+    motivo_natureza_anterior = df_anterior.groupby(['segmento', 'natureza', 'motivo'], observed=True).size()
+    fato_natureza_atual = df_atual.groupby(['segmento', 'natureza', 'fato_gerador_fato_gerador'], observed=True).size()
+    for segmento in segmentos_periodo:
+        st.subheader(f"Segmento: {segmento}")
+        # Calcula a variação nas contagens por natureza
+        count_atual_natureza = fatia_contagem(natureza_atual_geral, segmento)
+        count_anterior_natureza = fatia_contagem(natureza_anterior_geral, segmento)
+        naturezas_positivas = count_atual_natureza.subtract(count_anterior_natureza, fill_value=0)
+        
+        # Naturezas com Redução
+        st.markdown("### ✅ Naturezas com Redução")
+        for natureza, variacao in naturezas_positivas[naturezas_positivas < 0].nsmallest(5).items():
+            with st.expander(f"**{natureza}** (Redução de {abs(int(variacao))} reclamações)", expanded=False):
+                st.markdown("**Motivos relacionados:**")
+                motivos_atual = fatia_contagem(motivo_natureza_atual, (segmento, natureza)).sort_values(ascending=False)
+                motivos_anterior = fatia_contagem(motivo_natureza_anterior, (segmento, natureza))
+                comparacao_motivos = comparar_motivos(motivos_atual, motivos_anterior)
+                # Uma única mensagem ao frontend por lista, em vez de uma por linha
+                linhas_motivos = [
+                    f'<div class="motivo-item">▸ {motivo}: <span style="color: {cor}">{count_anterior} → {count_atual} ({var_motivo:.2f}%)</span></div>'
+                    for motivo, count_atual, count_anterior, var_motivo, cor in comparacao_motivos.itertuples()
+                ]
+                if linhas_motivos:
+                    st.markdown("\n".join(linhas_motivos), unsafe_allow_html=True)
+                st.markdown("**Fatos Geradores mais comuns:**")
+                fatos_geradores = fatia_contagem(fato_natureza_atual, (segmento, natureza))
+                linhas_fatos = [f"- {fato}: {count} ocorrências" for fato, count in fatos_geradores.nlargest(5).items()]
+                if linhas_fatos:
+                    st.markdown("\n".join(linhas_fatos))
+        
+        # Naturezas com Aumento
+        st.markdown("### 🚨 Naturezas com Aumento")
+        for natureza, variacao in naturezas_positivas[naturezas_positivas > 0].nlargest(5).items():
+            with st.expander(f"**{natureza}** (Aumento de {int(variacao)} reclamações)", expanded=False):
+                st.markdown("**Motivos relacionados:**")
+                motivos_atual = fatia_contagem(motivo_natureza_atual, (segmento, natureza)).sort_values(ascending=False)
+                motivos_anterior = fatia_contagem(motivo_natureza_anterior, (segmento, natureza))
+                comparacao_motivos = comparar_motivos(motivos_atual, motivos_anterior)
+                # Uma única mensagem ao frontend por lista, em vez de uma por linha
+                linhas_motivos = [
+                    f'<div class="motivo-item">▸ {motivo}: <span style="color: {cor}">{count_anterior} → {count_atual} ({var_motivo:.2f}%)</span></div>'
+                    for motivo, count_atual, count_anterior, var_motivo, cor in comparacao_motivos.itertuples()
+                ]
+                if linhas_motivos:
+                    st.markdown("\n".join(linhas_motivos), unsafe_allow_html=True)
+                st.markdown("**Fatos Geradores mais comuns:**")
+                fatos_geradores = fatia_contagem(fato_natureza_atual, (segmento, natureza))
+                linhas_fatos = [f"- {fato}: {count} ocorrências" for fato, count in fatos_geradores.nlargest(5).items()]
+                if linhas_fatos:
+                    st.markdown("\n".join(linhas_fatos))
+
+# Evolução mensal por segmento (todos os anos); não depende dos filtros de período
+@st.fragment
+def render_evolucao(df, segmentos):
+    st.header("📈 Evolução Mensal")
+    # Evolução mensal de todos os segmentos em um único groupby
+    evolucao_segmentos = df.groupby(['segmento', 'ano', 'mes'], observed=True).size().rename('Reclamações').reset_index(level=['ano', 'mes'])
+    # Cria coluna combinada "ano_mes" (ex.: Janeiro 2025) uma única vez para todos os segmentos
+    evolucao_segmentos['ano_mes'] = evolucao_segmentos['mes'].cat.rename_categories(str.capitalize).astype(str) + ' ' + evolucao_segmentos['ano'].astype(str)
+    for segmento in segmentos:
+        st.subheader(f"Segmento: {segmento}")
+        # Evolução Mensal do segmento (agrupando todos os anos)
+        df_evolucao = evolucao_segmentos.loc[[segmento]]
+        fig_evolucao = build_evolucao_fig(df_evolucao, segmento)
+        st.plotly_chart(fig_evolucao, use_container_width=True)
+
 # Interface de upload
 uploaded_file = st.file_uploader("Carregar arquivo CSV", type=["csv", "txt"])
 
 if uploaded_file:
     try:
-        df = pd.read_csv(uploaded_file, delimiter=";", low_memory=False, encoding='utf-8')
-        df = processar_dados(df)
+        df = load_df(uploaded_file.getvalue())
     except Exception as e:
         st.error(f"Erro ao carregar arquivo: {str(e)}")
         df = pd.DataFrame()
     
     if not df.empty:
-        # Filtros gerais
-        st.sidebar.header("🔍 Filtros de Análise")
-        anos_disponiveis = sorted(df['ano'].dropna().unique(), reverse=True)
-        ano_atual = st.sidebar.selectbox("Selecione o ano atual:", anos_disponiveis)
-        ano_anterior = st.sidebar.selectbox("Selecione o ano anterior:", anos_disponiveis)
-        
-        mes_atual = st.sidebar.selectbox("Mês atual:", ORDEM_MESES)
-        mes_anterior = st.sidebar.selectbox("Mês anterior:", ORDEM_MESES)
-        
-        # Filtros baseados em mês e ano
-        filtro_atual = (df['mes'] == mes_atual) & (df['ano'] == ano_atual)
-        filtro_anterior = (df['mes'] == mes_anterior) & (df['ano'] == ano_anterior)
-        
-        df_atual = df[filtro_atual]
-        df_anterior = df[filtro_anterior]
-        
-        total_atual = len(df_atual)
-        total_anterior = len(df_anterior)
-        var_diff = total_atual - total_anterior
-        variacao = ((var_diff) / total_anterior * 100) if total_anterior != 0 else 0
-        
-        # Resumo Geral
-        st.markdown("### 📊 Resumo Geral")
-        st.markdown(f"No mês de **{mes_atual.capitalize()} {ano_atual}**, tivemos uma variação de **{variacao:.2f}%** nas reclamações em comparação a {mes_anterior.capitalize()} {ano_anterior}.")
-        st.markdown(f"Total de reclamações: **{total_anterior} → {total_atual}**")
-        
-        # Impacto Geral por segmento no mês atual
-        segmento_contagem = df_atual['segmento'].value_counts(normalize=True) * 100
-        if not segmento_contagem.empty:
-            top_segmento = segmento_contagem.idxmax()
-            top_percentual = segmento_contagem.max()
-            st.markdown("📌 Impacto Geral")
-            st.markdown(f"O segmento **{top_segmento}** representa **{top_percentual:.2f}%** do total de reclamações em {mes_atual.capitalize()} {ano_atual}.")
-        
-        # Gráfico de comparação mensal com variação e cores (verde para redução, vermelho para aumento)
-        color_atual = '#f44336' if var_diff > 0 else '#4CAF50' if var_diff < 0 else 'gray'
-        fig_comp = go.Figure()
-        fig_comp.add_trace(go.Bar(
-            x=[mes_anterior.capitalize(), mes_atual.capitalize()],
-            y=[total_anterior, total_atual],
-            text=[total_anterior, total_atual],
-            textposition='auto',
-            marker_color=['blue', color_atual]
-        ))
-        fig_comp.update_layout(
-            title="🔄 Comparativo Mensal",
-            xaxis_title="Mês",
-            yaxis_title="Total de Reclamações",
-            template="plotly_white"
-        )
-        # Adiciona anotação com a variação percentual
-        fig_comp.add_annotation(
-            x=mes_atual.capitalize(),
-            y=total_atual,
-            text=f'Variação: {variacao:.2f}%',
-            showarrow=True,
-            arrowhead=1,
-            ax=0,
-            ay=-40,
-            font=dict(color=color_atual, size=14)
-        )
-        st.plotly_chart(fig_comp, use_container_width=True)
-        
-        # Análise por Segmento e Canal (resumido)
-        st.header("📊 Análise por Segmento e Canal")
-        for segmento in df['segmento'].dropna().unique():
-            st.subheader(f"Segmento: {segmento}")
-            for canal in ['Procon', 'Ouvidoria', 'Geral']:
-                df_atual_canal = df_atual if canal == 'Geral' else df_atual[df_atual['ds_canal'] == canal]
-                df_anterior_canal = df_anterior if canal == 'Geral' else df_anterior[df_anterior['ds_canal'] == canal]
-                if df_atual_canal.empty and df_anterior_canal.empty:
-                    continue
-                st.markdown(f"**{canal} - {mes_atual.capitalize()} {ano_atual} vs {mes_anterior.capitalize()} {ano_anterior}**")
-                # Comparação de Natureza
-                natureza_atual = df_atual_canal['natureza'].value_counts().rename("Atual")
-                natureza_anterior = df_anterior_canal['natureza'].value_counts().rename("Anterior")
-                comparacao_natureza = pd.concat([natureza_atual, natureza_anterior], axis=1).fillna(0)
-                comparacao_natureza['Variação'] = comparacao_natureza['Atual'] - comparacao_natureza['Anterior']
-                st.dataframe(comparacao_natureza)
-                # Comparação de Motivo
-                motivo_atual = df_atual_canal['motivo'].value_counts().rename("Atual")
-                motivo_anterior = df_anterior_canal['motivo'].value_counts().rename("Anterior")
-                comparacao_motivo = pd.concat([motivo_atual, motivo_anterior], axis=1).fillna(0)
-                comparacao_motivo['Variação'] = comparacao_motivo['Atual'] - comparacao_motivo['Anterior']
-                st.dataframe(comparacao_motivo)
-        
-        # Seção: Evolução Mensal e Análise Detalhada por Natureza
-        st.header("📈 Evolução Mensal e Análise Detalhada por Natureza")
-        for segmento in df['segmento'].dropna().unique():
-            st.subheader(f"Segmento: {segmento}")
-            # Evolução Mensal do segmento (agrupando todos os anos)
-            df_segmento = df[df['segmento'] == segmento]
-            df_evolucao = df_segmento.groupby(['ano', 'mes']).size().reset_index(name='Reclamações')
-            # Cria coluna combinada "ano_mes" (ex.: Janeiro 2025)
-            df_evolucao['ano_mes'] = df_evolucao['mes'].astype(str).str.capitalize() + ' ' + df_evolucao['ano'].astype(str)
-            
-            fig_evolucao = px.line(df_evolucao, x='ano_mes', y='Reclamações', 
-                                   title=f'Evolução Mensal de Reclamações - {segmento}',
-                                   labels={'ano_mes': 'Mês/Ano', 'Reclamações': 'Total de Reclamações'},
-                                   text='Reclamações',
-                                   color='ano')
-            fig_evolucao.update_traces(
-                mode='lines+markers+text',
-                textposition='top center',
-                marker=dict(size=10),
-                line=dict(width=2.5),
-                textfont=dict(size=14, color='#2c3e50')
-            )
-            fig_evolucao.update_layout(
-                xaxis_title='Mês/Ano',
-                yaxis_title='Total de Reclamações',
-                template='plotly_white',
-                hovermode='x unified',
-                showlegend=True,
-                legend_title_text='Ano'
-            )
-            st.plotly_chart(fig_evolucao, use_container_width=True)
-            
-            # Análise Detalhada por Natureza (comparando período atual e anterior)
-            df_segmento_atual = df_atual[df_atual['segmento'] == segmento]
-            df_segmento_anterior = df_anterior[df_anterior['segmento'] == segmento]
-            
-            st.markdown('<div class="natureza-header">🔍 Análise Detalhada por Natureza</div>', unsafe_allow_html=True)
-            
-            # Calcula a variação nas contagens por natureza
-            count_atual_natureza = df_segmento_atual['natureza'].value_counts()
-            count_anterior_natureza = df_segmento_anterior['natureza'].value_counts()
-            naturezas_positivas = count_atual_natureza.subtract(count_anterior_natureza, fill_value=0)
-            
-            # Naturezas com Redução
-            st.markdown("### ✅ Naturezas com Redução")
-            for natureza, variacao in naturezas_positivas.nsmallest(5).items():
-                if variacao < 0:
-                    with st.expander(f"**{natureza}** (Redução de {abs(int(variacao))} reclamações)", expanded=False):
-                        st.markdown("**Motivos relacionados:**")
-                        motivos_atual = df_segmento_atual[df_segmento_atual['natureza'] == natureza]['motivo'].value_counts()
-                        motivos_anterior = df_segmento_anterior[df_segmento_anterior['natureza'] == natureza]['motivo'].value_counts()
-                        for motivo, count_atual in motivos_atual.items():
-                            count_anterior = motivos_anterior.get(motivo, 0)
-                            var_motivo, _ = analisar_variacao(count_atual, count_anterior)
-                            st.markdown(f"""
-<div class="motivo-item">
-▸ {motivo}: 
-<span style="color: {'#4CAF50' if var_motivo < 0 else '#f44336'}">
-    {count_anterior} → {count_atual} ({var_motivo:.2f}%)
-</span>
-</div>
-""", unsafe_allow_html=True)
-                        st.markdown("**Fatos Geradores mais comuns:**")
-                        fatos_geradores = df_segmento_atual[df_segmento_atual['natureza'] == natureza]['fato_gerador_fato_gerador'].value_counts()
-                        for fato, count in fatos_geradores.head(5).items():
-                            st.markdown(f"- {fato}: {count} ocorrências")
-            
-            # Naturezas com Aumento
-            st.markdown("### 🚨 Naturezas com Aumento")
-            for natureza, variacao in naturezas_positivas.nlargest(5).items():
-                if variacao > 0:
-                    with st.expander(f"**{natureza}** (Aumento de {int(variacao)} reclamações)", expanded=False):
-                        st.markdown("**Motivos relacionados:**")
-                        motivos_atual = df_segmento_atual[df_segmento_atual['natureza'] == natureza]['motivo'].value_counts()
-                        motivos_anterior = df_segmento_anterior[df_segmento_anterior['natureza'] == natureza]['motivo'].value_counts()
-                        for motivo, count_atual in motivos_atual.items():
-                            count_anterior = motivos_anterior.get(motivo, 0)
-                            var_motivo, _ = analisar_variacao(count_atual, count_anterior)
-                            st.markdown(f"""
-<div class="motivo-item">
-▸ {motivo}: 
-<span style="color: {'#4CAF50' if var_motivo < 0 else '#f44336'}">
-    {count_anterior} → {count_atual} ({var_motivo:.2f}%)
-</span>
-</div>
-""", unsafe_allow_html=True)
-                        st.markdown("**Fatos Geradores mais comuns:**")
-                        fatos_geradores = df_segmento_atual[df_segmento_atual['natureza'] == natureza]['fato_gerador_fato_gerador'].value_counts()
-                        for fato, count in fatos_geradores.head(5).items():
-                            st.markdown(f"- {fato}: {count} ocorrências")
+        # Segmentos vêm direto das categorias, sem varrer a coluna
+        segmentos = list(df['segmento'].cat.categories)
+        render_comparativo(df, uploaded_file.file_id, segmentos)
+        render_evolucao(df, segmentos)
     else:
         st.warning("Nenhum dado válido encontrado após o processamento!")
 else: